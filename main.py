@@ -17,14 +17,29 @@ Note: Raspberry Pi sends images only. NVIDIA determines status codes:
 """
 
 import asyncio
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import signal
 import sys
+import time
+from functools import partial
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 try:
     from picamera2 import Picamera2, Preview
     import numpy as np
@@ -38,21 +53,55 @@ except ImportError:
     print("Warning: VL53L1X library not available. Running without ToF sensor.")
     VL53L1X = None
 
+# Optional faster JPEG encoders (libjpeg-turbo, then OpenCV); Pillow is the fallback
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
 import aiohttp
 import io
 from PIL import Image
 
 
+def to_namespace(value):
+    """Recursively convert nested config dicts into SimpleNamespace objects"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: to_namespace(v) for k, v in value.items()})
+    return value
+
+
+def pin_thread_to_cores(cores) -> None:
+    """Restrict the calling thread to the given CPU cores (Linux only)"""
+    try:
+        os.sched_setaffinity(0, set(cores))
+    except (AttributeError, OSError) as e:
+        logging.getLogger("SmoothBoxCamera").warning("Could not set CPU affinity %s: %s", cores, e)
+
+
 class ToFSensor:
     """VL53L1X Time-of-Flight Distance Sensor Handler"""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: SimpleNamespace):
         self.config = config
         self.logger = logging.getLogger("ToFSensor")
-        self.enabled = config.get("enabled", True) and VL53L1X is not None
+        self.enabled = getattr(config, "enabled", True) and VL53L1X is not None
         self.sensor = None
         self.current_distance = None
-        self.distance_history = []
+
+        # Fixed-size smoothing window with a running sum
+        smoothing_window = config.sampling.smoothing_window
+        self.distance_history = deque(maxlen=smoothing_window)
+        self._running_sum = 0
+
+        # Cached thresholds (avoid nested dict lookups per sample)
+        self._present_threshold = config.thresholds.vehicle_present_mm
+        self._absent_threshold = config.thresholds.vehicle_absent_mm
 
         if not self.enabled:
             self.logger.warning("ToF sensor disabled or library not available")
@@ -64,12 +113,12 @@ class ToFSensor:
 
         try:
             # Initialize VL53L1X sensor
-            self.sensor = VL53L1X.VL53L1X(i2c_bus=self.config["i2c_bus"], i2c_address=self.config["i2c_address"])
+            self.sensor = VL53L1X.VL53L1X(i2c_bus=self.config.i2c_bus, i2c_address=self.config.i2c_address)
             self.sensor.open()
             self.sensor.start_ranging(1)  # 1 = short distance mode
-            self.logger.info(f"ToF sensor initialized on I2C bus {self.config['i2c_bus']}")
+            self.logger.info("ToF sensor initialized on I2C bus %s", self.config.i2c_bus)
         except Exception as e:
-            self.logger.error(f"Failed to initialize ToF sensor: {e}")
+            self.logger.error("Failed to initialize ToF sensor: %s", e)
             self.enabled = False
 
     def read_distance(self) -> Optional[int]:
@@ -87,15 +136,15 @@ class ToFSensor:
             self.current_distance = distance
 
             # Update smoothing history
-            smoothing_window = self.config["sampling"]["smoothing_window"]
+            if len(self.distance_history) == self.distance_history.maxlen:
+                self._running_sum -= self.distance_history[0]
             self.distance_history.append(distance)
-            if len(self.distance_history) > smoothing_window:
-                self.distance_history.pop(0)
+            self._running_sum += distance
 
             return distance
 
         except Exception as e:
-            self.logger.error(f"Failed to read ToF sensor: {e}")
+            self.logger.error("Failed to read ToF sensor: %s", e)
             return None
 
     def get_smoothed_distance(self) -> Optional[int]:
@@ -103,7 +152,7 @@ class ToFSensor:
         if not self.distance_history:
             return self.current_distance
 
-        return int(sum(self.distance_history) / len(self.distance_history))
+        return int(self._running_sum / len(self.distance_history))
 
     def is_vehicle_present(self) -> bool:
         """Check if vehicle is currently present based on distance"""
@@ -111,8 +160,7 @@ class ToFSensor:
         if distance is None:
             return False
 
-        threshold = self.config["thresholds"]["vehicle_present_mm"]
-        return distance < threshold
+        return distance < self._present_threshold
 
     def is_vehicle_absent(self) -> bool:
         """Check if vehicle is absent based on distance"""
@@ -120,8 +168,7 @@ class ToFSensor:
         if distance is None:
             return True  # Assume absent if sensor fails
 
-        threshold = self.config["thresholds"]["vehicle_absent_mm"]
-        return distance > threshold
+        return distance > self._absent_threshold
 
     def close(self):
         """Close the sensor connection"""
@@ -130,18 +177,39 @@ class ToFSensor:
                 self.sensor.stop_ranging()
                 self.sensor.close()
             except Exception as e:
-                self.logger.error(f"Error closing ToF sensor: {e}")
+                self.logger.error("Error closing ToF sensor: %s", e)
 
 
 class CameraHandler:
     """Raspberry Pi Camera Handler"""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: SimpleNamespace):
         self.config = config
         self.logger = logging.getLogger("CameraHandler")
         self.camera = None
         self.enabled = Picamera2 is not None
 
+        # Reusable encode buffer (avoids a new BytesIO per capture)
+        self._encode_buf = io.BytesIO()
+        self.image_format = config.format.lower()
+        self._quality = config.quality
+
+        # Adaptive compression: step quality down until an image fits target_bytes
+        self._target_bytes = getattr(config, "target_bytes", 0)
+        self._min_quality = getattr(config, "min_quality", 35)
+
+        # Encoded simulation-mode images, per format
+        self._dummy_images = {}
+
+        # Array-based JPEG encoder, selected in initialize()
+        self._jpeg_encode = None
+        self._turbojpeg = None
+
+        # True when the main stream is YUV420 (fed straight to TurboJPEG);
+        # only used when every capture is JPEG
+        self._yuv = False
+        self._size = (config.resolution.width, config.resolution.height)
+
         if not self.enabled:
             self.logger.warning("picamera2 not available. Running in simulation mode.")
 
@@ -152,74 +220,156 @@ class CameraHandler:
 
         try:
             self.camera = Picamera2()
-
-            # Configure camera
-            camera_config = self.camera.create_still_configuration(
-                main={
-                    "size": (
-                        self.config["resolution"]["width"],
-                        self.config["resolution"]["height"]
-                    ),
-                    "format": "RGB888"
-                }
-            )
-            self.camera.configure(camera_config)
+            self._select_jpeg_encoder()
+
+            # Configure camera: TurboJPEG takes the ISP's native YUV420 directly,
+            # every other encoder (and WebP output) needs RGB
+            verification = getattr(self.config, "verification", None)
+            formats = {self.image_format, getattr(verification, "format", self.image_format).lower()}
+            self._yuv = self._turbojpeg is not None and formats == {"jpeg"}
+            self._configure_stream("YUV420" if self._yuv else "RGB888")
+
+            # YUV frames are only usable unpadded; fall back to RGB otherwise
+            main_stream = self.camera.camera_configuration()["main"]
+            if self._yuv and (main_stream["stride"] != self._size[0] or tuple(main_stream["size"]) != self._size):
+                self.logger.info("YUV420 stream is padded at this size, capturing RGB888 instead")
+                self._yuv = False
+                self._configure_stream("RGB888")
 
             # Set camera parameters
-            if self.config.get("rotation"):
-                self.camera.set_controls({"Rotation": self.config["rotation"]})
+            if getattr(self.config, "rotation", None):
+                self.camera.set_controls({"Rotation": self.config.rotation})
 
-            if self.config.get("brightness"):
-                self.camera.set_controls({"Brightness": self.config["brightness"] / 100.0})
+            if getattr(self.config, "brightness", None):
+                self.camera.set_controls({"Brightness": self.config.brightness / 100.0})
 
             self.camera.start()
             self.logger.info("Raspberry Pi camera initialized")
 
         except Exception as e:
-            self.logger.error(f"Failed to initialize camera: {e}")
+            self.logger.error("Failed to initialize camera: %s", e)
             self.enabled = False
 
-    def capture_image(self) -> Optional[bytes]:
+    def _configure_stream(self, pixel_format: str):
+        """Configure the main still stream with the given pixel format"""
+        camera_config = self.camera.create_still_configuration(
+            main={"size": self._size, "format": pixel_format}
+        )
+        self.camera.configure(camera_config)
+
+    def capture_image(
+        self,
+        target_bytes: Optional[int] = None,
+        image_format: Optional[str] = None,
+        quality: Optional[int] = None,
+    ) -> Optional[bytes]:
         """
         Capture image from camera
 
+        Args:
+            target_bytes: Size budget in bytes (0 = no limit), defaults to camera.target_bytes
+            image_format: "jpeg" or "webp", defaults to camera.format
+            quality: Starting quality, defaults to camera.quality
+
         Returns:
-            JPEG image as bytes, or None if capture failed
+            Encoded image as bytes, or None if capture failed
         """
+        if target_bytes is None:
+            target_bytes = self._target_bytes
+        image_format = (image_format or self.image_format).lower()
+        quality = quality or self._quality
+
         if not self.enabled:
             # Simulation mode: return dummy image
-            return self._create_dummy_image()
+            return self._create_dummy_image(image_format)
 
         try:
-            # Capture image
-            image_array = self.camera.capture_array()
+            request = self.camera.capture_request()
+            try:
+                if image_format == "jpeg" and self._yuv:
+                    # Hand the planar YUV420 frame to TurboJPEG, no colour conversion
+                    frame = request.make_buffer("main")
+                    encode = partial(self._encode_turbojpeg_yuv, frame)
+                elif image_format == "jpeg" and self._jpeg_encode is not None:
+                    # Encode the raw frame directly, no PIL image in between
+                    frame = request.make_array("main")
+                    encode = partial(self._jpeg_encode, frame)
+                else:
+                    pil_image = request.make_image("main")
+                    encode = partial(self._encode_pil, pil_image, image_format)
+            finally:
+                request.release()
+
+            return self._encode_to_fit(encode, quality, target_bytes)
+
+        except Exception as e:
+            self.logger.error("Failed to capture image: %s", e)
+            return None
 
-            # Convert to PIL Image
-            pil_image = Image.fromarray(image_array)
+    def _select_jpeg_encoder(self):
+        """Pick the fastest available array-based JPEG encoder"""
+        if TurboJPEG is not None:
+            try:
+                self._turbojpeg = TurboJPEG()
+                self._jpeg_encode = self._encode_turbojpeg
+                self.logger.info("Using TurboJPEG encoder")
+                return
+            except Exception as e:
+                self.logger.warning("TurboJPEG unavailable: %s", e)
 
-            # Encode as JPEG
-            buffer = io.BytesIO()
-            pil_image.save(
-                buffer,
-                format=self.config["format"].upper(),
-                quality=self.config["quality"]
-            )
-            buffer.seek(0)
+        if cv2 is not None:
+            self._jpeg_encode = self._encode_cv2
+            self.logger.info("Using OpenCV JPEG encoder")
 
-            return buffer.getvalue()
+    def _encode_turbojpeg(self, frame, quality: int) -> bytes:
+        """Encode a BGR frame (picamera2 RGB888) with libjpeg-turbo"""
+        return self._turbojpeg.encode(frame, quality=quality, pixel_format=TJPF_BGR)
 
-        except Exception as e:
-            self.logger.error(f"Failed to capture image: {e}")
-            return None
+    def _encode_turbojpeg_yuv(self, frame, quality: int) -> bytes:
+        """Encode a planar YUV420 frame with libjpeg-turbo"""
+        width, height = self._size
+        return self._turbojpeg.encode_from_yuv(
+            frame, height, width, quality=quality, jpeg_subsample=TJSAMP_420
+        )
+
+    def _encode_cv2(self, frame, quality: int) -> bytes:
+        """Encode a BGR frame (picamera2 RGB888) with OpenCV"""
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise RuntimeError("cv2.imencode failed")
+        return encoded.tobytes()
 
-    def _create_dummy_image(self) -> bytes:
-        """Create a dummy image for testing"""
-        image = Image.new('RGB', (640, 480), color='blue')
-        buffer = io.BytesIO()
-        image.save(buffer, format='JPEG', quality=85)
+    def _encode_pil(self, pil_image: Image.Image, image_format: str, quality: int) -> bytes:
+        """Encode a PIL image into the reusable buffer"""
+        buffer = self._encode_buf
         buffer.seek(0)
+        buffer.truncate(0)
+        options = {"method": 0} if image_format == "webp" else {}
+        pil_image.save(buffer, format=image_format.upper(), quality=quality, **options)
         return buffer.getvalue()
 
+    def _encode_to_fit(self, encode, quality: int, target_bytes: int) -> bytes:
+        """Encode, lowering quality until the result fits target_bytes"""
+        quality = max(self._min_quality, quality)
+
+        while True:
+            data = encode(quality)
+
+            if not target_bytes or len(data) <= target_bytes or quality <= self._min_quality:
+                return data
+
+            quality = max(self._min_quality, quality - 5)
+
+    def _create_dummy_image(self, image_format: str = "jpeg") -> bytes:
+        """Create a dummy image for testing (encoded once per format)"""
+        dummy = self._dummy_images.get(image_format)
+        if dummy is None:
+            image = Image.new('RGB', (640, 480), color='blue')
+            buffer = io.BytesIO()
+            image.save(buffer, format=image_format.upper(), quality=85)
+            dummy = self._dummy_images[image_format] = buffer.getvalue()
+        return dummy
+
     def close(self):
         """Close the camera"""
         if self.camera:
@@ -227,65 +377,161 @@ class CameraHandler:
                 self.camera.stop()
                 self.camera.close()
             except Exception as e:
-                self.logger.error(f"Error closing camera: {e}")
+                self.logger.error("Error closing camera: %s", e)
 
 
 class NVIDIAClient:
     """Client for sending images to NVIDIA Jetson Orin"""
 
-    def __init__(self, config: dict, station_id: str, spot_number: int):
+    def __init__(self, config: SimpleNamespace, station_id: str, spot_number: int):
         self.config = config
         self.station_id = station_id
         self.spot_number = spot_number
         self.logger = logging.getLogger("NVIDIAClient")
 
         # Build endpoint URL
-        protocol = config.get("protocol", "http")
-        ip = config["ip_address"]
-        port = config["port"]
-        endpoint = config.get("endpoint", "/receive_image")
+        protocol = getattr(config, "protocol", "http")
+        ip = config.ip_address
+        port = config.port
+        endpoint = getattr(config, "endpoint", "/receive_image")
         self.url = f"{protocol}://{ip}:{port}{endpoint}"
 
-        self.logger.info(f"NVIDIA client configured: {self.url}")
+        # Shared HTTP session (created lazily, reused across sends)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Callers wait here rather than queueing inside aiohttp's connector
+        self._max_connections = getattr(config, "max_connections", 4)
+        self._request_slots = asyncio.Semaphore(self._max_connections)
 
-    async def send_image(self, image_data: bytes) -> bool:
+        self.logger.info("NVIDIA client configured: %s", self.url)
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._max_connections,
+                limit_per_host=self._max_connections,
+                keepalive_timeout=120,
+                force_close=False,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=connector,
+                headers={"Connection": "keep-alive"},
+            )
+        return self._session
+
+    @staticmethod
+    def _file_extension(image_format: str) -> str:
+        """Filename extension for an image format"""
+        return "jpg" if image_format == "jpeg" else image_format
+
+    @staticmethod
+    def _append_file(writer: aiohttp.MultipartWriter, name: str, data: bytes, filename: str, content_type: str):
+        """Append a file part backed by a memoryview of data"""
+        part = writer.append(memoryview(data), {aiohttp.hdrs.CONTENT_TYPE: content_type})
+        part.set_content_disposition('form-data', name=name, filename=filename)
+
+    @staticmethod
+    def _append_field(writer: aiohttp.MultipartWriter, name: str, value: str):
+        """Append a plain form field"""
+        part = writer.append(value)
+        part.set_content_disposition('form-data', name=name)
+
+    async def send_image(
+        self,
+        image_data: bytes,
+        image_format: str = "jpeg",
+        timestamp_ms: Optional[int] = None,
+    ) -> bool:
         """
         Send image to NVIDIA Jetson Orin
 
         Args:
-            image_data: JPEG image as bytes
+            image_data: Encoded image as bytes
+            image_format: Image encoding, "jpeg" or "webp"
+            timestamp_ms: Capture time in epoch ms, defaults to now
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Prepare multipart form data
-            data = aiohttp.FormData()
-            data.add_field('image',
-                          image_data,
-                          filename='capture.jpg',
-                          content_type='image/jpeg')
-            data.add_field('station_id', self.station_id)
-            data.add_field('spot_number', str(self.spot_number))
-            data.add_field('timestamp', datetime.now().isoformat())
+            # Prepare multipart body (image part wraps the bytes without copying)
+            data = aiohttp.MultipartWriter('form-data')
+            if timestamp_ms is None:
+                timestamp_ms = time.time_ns() // 1_000_000
+            extension = self._file_extension(image_format)
+            self._append_file(data, 'image', image_data, f'capture.{extension}', f'image/{image_format}')
+            self._append_field(data, 'station_id', self.station_id)
+            self._append_field(data, 'spot_number', str(self.spot_number))
+            self._append_field(data, 'timestamp', str(timestamp_ms))
 
             # Send request
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.url, data=data, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        self.logger.debug(f"Image sent successfully (spot #{self.spot_number})")
-                        return True
-                    else:
-                        self.logger.warning(f"Image send failed: HTTP {response.status}")
-                        return False
+            session = await self._ensure_session()
+            async with self._request_slots, session.post(self.url, data=data) as response:
+                if response.status == 200:
+                    self.logger.debug("Image sent successfully (spot #%s)", self.spot_number)
+                    return True
+                else:
+                    self.logger.warning("Image send failed: HTTP %s", response.status)
+                    return False
 
         except asyncio.TimeoutError:
             self.logger.error("Image send timeout")
             return False
         except Exception as e:
-            self.logger.error(f"Failed to send image: {e}")
+            self.logger.error("Failed to send image: %s", e)
+            return False
+
+    async def send_image_batch(self, images: List[Tuple[bytes, int]], image_format: str = "jpeg") -> bool:
+        """
+        Send several images to NVIDIA Jetson Orin in one multipart request
+
+        Args:
+            images: List of (encoded image, capture time in epoch ms) tuples
+            image_format: Image encoding of every image, "jpeg" or "webp"
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            # Prepare multipart body: image_0 .. image_{n-1}
+            data = aiohttp.MultipartWriter('form-data')
+            extension = self._file_extension(image_format)
+            for i, (image_data, _) in enumerate(images):
+                self._append_file(data, f'image_{i}', image_data, f'capture_{i}.{extension}', f'image/{image_format}')
+            self._append_field(data, 'station_id', self.station_id)
+            self._append_field(data, 'spot_number', str(self.spot_number))
+            self._append_field(data, 'count', str(len(images)))
+            self._append_field(data, 'timestamps', json.dumps([ts for _, ts in images]))
+
+            # Send request
+            session = await self._ensure_session()
+            async with self._request_slots, session.post(self.url, data=data) as response:
+                if response.status == 200:
+                    self.logger.debug("Batch of %s images sent successfully (spot #%s)", len(images), self.spot_number)
+                    return True
+                else:
+                    self.logger.warning("Image batch send failed: HTTP %s", response.status)
+                    return False
+
+        except asyncio.TimeoutError:
+            self.logger.error("Image batch send timeout")
+            return False
+        except Exception as e:
+            self.logger.error("Failed to send image batch: %s", e)
             return False
 
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            try:
+                await self._session.close()
+            except Exception as e:
+                self.logger.error("Error closing HTTP session: %s", e)
+            self._session = None
+
 
 class SmoothBoxCamera:
     """Main application for Raspberry Pi camera system"""
@@ -296,44 +542,114 @@ class SmoothBoxCamera:
         self.running = False
 
         # Initialize components
-        self.tof_sensor = ToFSensor(self.config["tof_sensor"])
-        self.camera = CameraHandler(self.config["camera"])
+        self.tof_sensor = ToFSensor(self.config.tof_sensor)
+        self.camera = CameraHandler(self.config.camera)
         self.nvidia_client = NVIDIAClient(
-            self.config["nvidia"],
-            self.config["device"]["station_id"],
-            self.config["device"]["spot_number"]
+            self.config.nvidia,
+            self.config.device.station_id,
+            self.config.device.spot_number
         )
 
+        # One worker thread each for blocking camera and I2C calls (keeps each device serialized),
+        # optionally pinned to their own cores
+        affinity = getattr(getattr(self.config, "performance", None), "cpu_affinity", None)
+        self._pin_cores = bool(getattr(affinity, "enabled", False))
+        self._main_cores = getattr(affinity, "main_cores", None)
+        self._camera_exec = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="smoothbox-camera",
+            initializer=self._core_pinner(getattr(affinity, "camera_cores", None)),
+        )
+        self._tof_exec = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="smoothbox-tof",
+            initializer=self._core_pinner(getattr(affinity, "tof_cores", None)),
+        )
+
+        # Cached trigger settings (avoid nested dict lookups in loops)
+        triggers = self.config.tof_sensor.triggers
+        self._sample_interval = 1.0 / self.config.tof_sensor.sampling.frequency_hz
+        self._entry_cfg = triggers.entry_event
+        self._exit_cfg = triggers.exit_event
+        self._periodic_cfg = triggers.periodic_check
+        self._fallback_cfg = self.config.fallback.periodic_capture
+
+        # Capture settings for verification images (smaller, lower fidelity)
+        verification = getattr(self.config.camera, "verification", None)
+        self._verification_capture = {
+            "image_format": getattr(verification, "format", self.config.camera.format).lower(),
+            "quality": getattr(verification, "quality", None),
+            "target_bytes": getattr(verification, "target_bytes", None),
+        }
+
         # State management
         self.vehicle_present = False
         self.last_entry_time = None
         self.last_exit_time = None
         self.last_verification_time = None
 
-    def _load_config(self, config_path: str) -> dict:
-        """Load configuration from YAML file"""
+        # Presence transitions signalled by the ToF monitor
+        self._entered_event = asyncio.Event()
+        self._exited_event = asyncio.Event()
+
+        # Bounds in-flight pipelined sends during capture sequences
+        self._send_slots = asyncio.Semaphore(2)
+
+        # Running entry sequence; a newer entry cancels and replaces it
+        self._entry_task: Optional[asyncio.Task] = None
+
+        # Background tasks, cancelled on stop()
+        self._tasks = set()
+        self._stop_task: Optional[asyncio.Task] = None
+
+    def _core_pinner(self, cores):
+        """Executor initializer that pins its thread to cores, or None when pinning is off"""
+        if not self._pin_cores or not cores:
+            return None
+        return partial(pin_thread_to_cores, cores)
+
+    def _load_config(self, config_path: str) -> SimpleNamespace:
+        """Load configuration from YAML file (libyaml loader when available)"""
         with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+            return to_namespace(yaml.load(f, Loader=SafeLoader))
 
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
-        log_config = self.config["logging"]
-        log_file = Path(log_config["file"])
+        log_config = self.config.logging
+        log_file = Path(log_config.file)
         log_file.parent.mkdir(parents=True, exist_ok=True)
 
+        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+        handlers = [
+            logging.FileHandler(log_file),
+            logging.StreamHandler(sys.stdout),
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        # File/console writes happen on a listener thread, so slow SD-card
+        # writes never block the event loop
+        log_queue = queue.SimpleQueue()
+        self._log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        self._log_listener.start()
+
+        # Flush queued records at interpreter exit, after the event loop has shut
+        # down and even if start() raised (runs before logging's own shutdown)
+        atexit.register(self._log_listener.stop)
+
+        # Records are formatted by the listener's handlers, so the queue
+        # handler only passes the message through
         logging.basicConfig(
-            level=getattr(logging, log_config["level"]),
-            format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout),
-            ],
+            level=getattr(logging, log_config.level),
+            format="%(message)s",
+            handlers=[logging.handlers.QueueHandler(log_queue)],
         )
 
         logger = logging.getLogger("SmoothBoxCamera")
         logger.info(
-            f"Camera initialized - Station: {self.config['device']['station_id']} | "
-            f"Spot: {self.config['device']['spot_number']}"
+            "Camera initialized - Station: %s | Spot: %s",
+            self.config.device.station_id,
+            self.config.device.spot_number,
         )
         return logger
 
@@ -341,6 +657,10 @@ class SmoothBoxCamera:
         """Start the camera system"""
         self.logger.info("Starting SmoothBox Camera System")
 
+        # Keep the event loop thread off the camera/ToF cores
+        if self._pin_cores and self._main_cores:
+            pin_thread_to_cores(self._main_cores)
+
         # Initialize hardware
         self.tof_sensor.initialize()
         self.camera.initialize()
@@ -349,27 +669,66 @@ class SmoothBoxCamera:
 
         # Start background tasks
         tasks = [
-            asyncio.create_task(self._tof_monitoring_loop()),
-            asyncio.create_task(self._periodic_verification_loop()),
+            self._spawn(self._tof_monitoring_loop()),
+            self._spawn(self._periodic_verification_loop()),
         ]
 
         # Add fallback task if ToF is disabled
         if not self.tof_sensor.enabled:
-            tasks.append(asyncio.create_task(self._fallback_capture_loop()))
+            tasks.append(self._spawn(self._fallback_capture_loop()))
 
         self.logger.info("All systems operational")
 
-        # Wait for tasks
-        await asyncio.gather(*tasks)
+        # Wait for tasks (stop() cancels them; failures are logged by _on_task_done)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Let a signal-triggered stop() finish closing hardware
+        if self._stop_task is not None:
+            await self._stop_task
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a background task that stop() will cancel"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task: asyncio.Task):
+        """Forget a finished background task, logging it if it failed"""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(
+                "Background task %s failed", task.get_coro().__qualname__, exc_info=task.exception()
+            )
 
     async def stop(self):
         """Stop the camera system"""
+        if not self.running:
+            return
+
         self.logger.info("Stopping SmoothBox Camera System")
         self.running = False
 
+        # Wake any loop waiting on a presence transition
+        self._entered_event.set()
+        self._exited_event.set()
+
+        # Cancel background loops and in-flight sends, and wait for them to finish
+        while self._tasks:
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Let any in-flight sensor/camera call finish before closing hardware,
+        # without blocking the event loop while waiting
+        await asyncio.to_thread(self._camera_exec.shutdown, wait=True, cancel_futures=True)
+        await asyncio.to_thread(self._tof_exec.shutdown, wait=True, cancel_futures=True)
+
         # Close hardware
         self.tof_sensor.close()
         self.camera.close()
+        await self.nvidia_client.close()
 
         self.logger.info("System stopped")
 
@@ -379,12 +738,15 @@ class SmoothBoxCamera:
             self.logger.info("ToF monitoring disabled")
             return
 
-        sample_interval = 1.0 / self.config["tof_sensor"]["sampling"]["frequency_hz"]
+        loop = asyncio.get_running_loop()
+        sample_interval = self._sample_interval
+        entry_enabled = self._entry_cfg.enabled
+        exit_enabled = self._exit_cfg.enabled and self._exit_cfg.send_immediate
 
         while self.running:
             try:
                 # Read sensor
-                distance = self.tof_sensor.read_distance()
+                distance = await loop.run_in_executor(self._tof_exec, self.tof_sensor.read_distance)
 
                 if distance is None:
                     await asyncio.sleep(sample_interval)
@@ -396,111 +758,229 @@ class SmoothBoxCamera:
 
                 # Entry event: vehicle just arrived
                 if is_present and not self.vehicle_present:
-                    self.logger.info(f"Vehicle entry detected (distance: {distance}mm)")
+                    self.logger.info("Vehicle entry detected (distance: %smm)", distance)
                     self.vehicle_present = True
                     self.last_entry_time = datetime.now()
+                    self._exited_event.clear()
+                    self._entered_event.set()
 
                     # Trigger entry image capture
-                    if self.config["tof_sensor"]["triggers"]["entry_event"]["enabled"]:
-                        asyncio.create_task(self._capture_entry_sequence())
+                    if entry_enabled:
+                        self._request_entry_sequence()
 
                 # Exit event: vehicle just left
                 elif is_absent and self.vehicle_present:
-                    self.logger.info(f"Vehicle exit detected (distance: {distance}mm)")
+                    self.logger.info("Vehicle exit detected (distance: %smm)", distance)
                     self.vehicle_present = False
                     self.last_exit_time = datetime.now()
+                    self._entered_event.clear()
+                    self._exited_event.set()
 
                     # Trigger exit image capture
-                    if self.config["tof_sensor"]["triggers"]["exit_event"]["enabled"]:
-                        if self.config["tof_sensor"]["triggers"]["exit_event"]["send_immediate"]:
-                            asyncio.create_task(self._capture_single_image("exit"))
+                    if exit_enabled:
+                        self._spawn(self._capture_single_image("exit"))
 
                 await asyncio.sleep(sample_interval)
 
             except Exception as e:
-                self.logger.error(f"Error in ToF monitoring: {e}")
+                self.logger.error("Error in ToF monitoring: %s", e)
                 await asyncio.sleep(1)
 
+    def _request_entry_sequence(self):
+        """Start an entry sequence for a new vehicle, replacing any running one"""
+        if self._entry_task is not None and not self._entry_task.done():
+            self.logger.info("New vehicle entry, restarting entry capture sequence")
+            self._entry_task.cancel()
+
+        # Tracked so stop() cancels it
+        self._entry_task = self._spawn(self._capture_entry_sequence())
+
     async def _capture_entry_sequence(self):
         """Capture sequence of images during vehicle entry"""
-        config = self.config["tof_sensor"]["triggers"]["entry_event"]
-        duration = config["send_duration_seconds"]
-        interval = config["send_interval_seconds"]
+        config = self._entry_cfg
+        duration = config.send_duration_seconds
+        interval = config.send_interval_seconds
+        batch_size = max(1, getattr(config, "batch_size", 1))
+        max_delay = getattr(config, "batch_max_delay_seconds", 2)
+
+        self.logger.info("Starting entry capture sequence: %ss @ %ss intervals", duration, interval)
+
+        frame_count = max(1, int(round(duration / interval)))
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + duration
+        pending = set()
+        batch = []
+
+        for i in range(frame_count):
+            # Capture time and send back-pressure must not stretch the sequence
+            if not self.running or loop.time() >= deadline:
+                break
 
-        self.logger.info(f"Starting entry capture sequence: {duration}s @ {interval}s intervals")
+            try:
+                image_data = await self._capture_frame()
+                if image_data is not None:
+                    batch.append((image_data, time.time_ns() // 1_000_000))
+                    if len(batch) == 1:
+                        batch_due = loop.time() + max_delay
+
+                # Send when the batch is full, or when waiting for the next
+                # frame would hold the oldest image past max_delay
+                if batch and (len(batch) >= batch_size or start + (i + 1) * interval > batch_due):
+                    await self._dispatch_send(batch, "entry", pending)
+                    batch = []
+            except Exception as e:
+                self.logger.error("Error capturing image: %s", e)
 
-        end_time = datetime.now() + timedelta(seconds=duration)
+            # Sleep until the next frame is due, not a full interval after this one
+            await asyncio.sleep(max(0.0, start + (i + 1) * interval - loop.time()))
 
-        while datetime.now() < end_time and self.running:
-            await self._capture_single_image("entry")
-            await asyncio.sleep(interval)
+        # Flush a partially filled batch
+        if batch:
+            await self._dispatch_send(batch, "entry", pending)
+
+        # wait() rather than gather(): if this sequence is replaced, its
+        # in-flight sends still finish
+        if pending:
+            await asyncio.wait(pending)
 
         self.logger.info("Entry capture sequence complete")
 
+    async def _capture_frame(self, **capture_kwargs) -> Optional[bytes]:
+        """Capture a single image without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        image_data = await loop.run_in_executor(
+            self._camera_exec, partial(self.camera.capture_image, **capture_kwargs)
+        )
+
+        if image_data is None:
+            self.logger.warning("Failed to capture image")
+
+        return image_data
+
+    async def _dispatch_send(self, batch: List[Tuple[bytes, int]], event_type: str, pending: set):
+        """Start sending a batch in the background, waiting for a free send slot first"""
+        await self._send_slots.acquire()
+
+        # Tracked so stop() cancels it
+        task = self._spawn(self._send_batch(batch, event_type))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        task.add_done_callback(self._on_send_done)
+
+    async def _send_batch(self, batch: List[Tuple[bytes, int]], event_type: str):
+        """Send captured images to NVIDIA, as one request when there are several"""
+        image_format = self.camera.image_format
+        if len(batch) == 1:
+            image_data, timestamp_ms = batch[0]
+            await self._send_captured(image_data, event_type, image_format, timestamp_ms)
+            return
+
+        success = await self.nvidia_client.send_image_batch(batch, image_format)
+
+        if success:
+            self.logger.debug("%s batch of %s images sent", event_type.capitalize(), len(batch))
+        else:
+            self.logger.warning("Failed to send %s batch of %s images", event_type, len(batch))
+
+    async def _send_captured(
+        self,
+        image_data: bytes,
+        event_type: str,
+        image_format: str = "jpeg",
+        timestamp_ms: Optional[int] = None,
+    ):
+        """Send an already captured image to NVIDIA"""
+        success = await self.nvidia_client.send_image(image_data, image_format, timestamp_ms)
+
+        if success:
+            self.logger.debug("%s image sent", event_type.capitalize())
+        else:
+            self.logger.warning("Failed to send %s image", event_type)
+
+    def _on_send_done(self, task: asyncio.Task):
+        """Release the send slot (errors are logged by _on_task_done)"""
+        self._send_slots.release()
+
     async def _capture_single_image(self, event_type: str = "capture"):
         """Capture and send a single image to NVIDIA"""
         try:
-            # Capture image
-            image_data = self.camera.capture_image()
+            if event_type == "verification":
+                capture_kwargs = self._verification_capture
+            else:
+                capture_kwargs = {}
+
+            image_data = await self._capture_frame(**capture_kwargs)
+            timestamp_ms = time.time_ns() // 1_000_000
 
             if image_data is None:
-                self.logger.warning("Failed to capture image")
                 return
 
-            # Send to NVIDIA
-            success = await self.nvidia_client.send_image(image_data)
-
-            if success:
-                self.logger.debug(f"{event_type.capitalize()} image sent")
-            else:
-                self.logger.warning(f"Failed to send {event_type} image")
+            image_format = capture_kwargs.get("image_format", self.camera.image_format)
+            await self._send_captured(image_data, event_type, image_format, timestamp_ms)
 
         except Exception as e:
-            self.logger.error(f"Error capturing image: {e}")
+            self.logger.error("Error capturing image: %s", e)
 
     async def _periodic_verification_loop(self):
         """Periodic verification while vehicle is parked"""
-        if not self.config["tof_sensor"]["triggers"]["periodic_check"]["enabled"]:
+        config = self._periodic_cfg
+        if not config.enabled:
             self.logger.info("Periodic verification disabled")
             return
 
-        interval = self.config["tof_sensor"]["triggers"]["periodic_check"]["interval_seconds"]
-        duration = self.config["tof_sensor"]["triggers"]["periodic_check"]["send_duration_seconds"]
-        send_interval = self.config["tof_sensor"]["triggers"]["periodic_check"]["send_interval_seconds"]
+        interval = config.interval_seconds
+        duration = config.send_duration_seconds
+        send_interval = config.send_interval_seconds
+        frame_count = max(1, int(round(duration / send_interval)))
+        loop = asyncio.get_running_loop()
 
         while self.running:
-            await asyncio.sleep(interval)
+            # Idle until a vehicle is present
+            await self._entered_event.wait()
+
+            # Wait one interval, unless the vehicle leaves first
+            try:
+                await asyncio.wait_for(self._exited_event.wait(), timeout=interval)
+                continue
+            except asyncio.TimeoutError:
+                pass
 
-            if not self.vehicle_present:
+            if not self.vehicle_present or not self.running:
                 continue
 
             self.logger.info("Starting periodic verification check")
             self.last_verification_time = datetime.now()
 
-            # Send images for verification duration
-            end_time = datetime.now() + timedelta(seconds=duration)
-            while datetime.now() < end_time and self.running and self.vehicle_present:
+            # Send images for verification duration; each send is awaited, so
+            # keep to the schedule and stop at the deadline
+            start = loop.time()
+            deadline = start + duration
+            for i in range(frame_count):
+                if not self.running or not self.vehicle_present or loop.time() >= deadline:
+                    break
                 await self._capture_single_image("verification")
-                await asyncio.sleep(send_interval)
+                await asyncio.sleep(max(0.0, start + (i + 1) * send_interval - loop.time()))
 
             self.logger.info("Verification check complete")
 
     async def _fallback_capture_loop(self):
         """Fallback periodic capture when ToF sensor is disabled"""
-        if not self.config["fallback"]["periodic_capture"]["enabled"]:
+        if not self._fallback_cfg.enabled:
             return
 
-        interval = self.config["fallback"]["periodic_capture"]["interval_seconds"]
-        self.logger.info(f"Fallback periodic capture enabled: every {interval}s")
+        interval = self._fallback_cfg.interval_seconds
+        self.logger.info("Fallback periodic capture enabled: every %ss", interval)
 
         while self.running:
             await asyncio.sleep(interval)
             await self._capture_single_image("fallback")
 
-    def handle_shutdown(self, signum, frame):
-        """Handle shutdown signals"""
-        self.logger.info(f"Received signal {signum}, shutting down...")
-        asyncio.create_task(self.stop())
+    def handle_shutdown(self, signum: int):
+        """Handle shutdown signals (runs on the event loop via add_signal_handler)"""
+        self.logger.info("Received signal %s, shutting down...", signal.Signals(signum).name)
+        if self._stop_task is None:
+            self._stop_task = asyncio.create_task(self.stop())
 
 
 async def main():
@@ -518,9 +998,10 @@ async def main():
     # Create and start system
     system = SmoothBoxCamera(args.config)
 
-    # Setup signal handlers
-    signal.signal(signal.SIGINT, system.handle_shutdown)
-    signal.signal(signal.SIGTERM, system.handle_shutdown)
+    # Setup signal handlers on the event loop
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, system.handle_shutdown, signum)
 
     # Start system
     await system.start()